@@ -4,32 +4,73 @@
 from __future__ import annotations
 
 import argparse
+import atexit
+import hashlib
+import io
+import os
+import queue
 import re
+import shutil
 import sys
+import threading
+import zipfile
+from contextlib import contextmanager
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from tempfile import TemporaryDirectory
-from typing import Dict, Iterable, List
+from tempfile import TemporaryDirectory, mkdtemp, mkstemp
+from typing import Callable, Dict, Iterable, Iterator, List, Sequence, Set
 
 import openpyxl
 from docx import Document
 from docx.document import Document as _Document
 from docx.table import Table
 from docx.text.paragraph import Paragraph
+from lxml import etree
 
 try:
     from docx2msg import Docx2Msg
+    from docxtpl import DocxTemplate
+    from jinja2 import Environment
 except ImportError as exc:  # pragma: no cover - dependency missing
     raise SystemExit(
         "docx2msg 패키지를 찾을 수 없습니다. 먼저 `pip install docx2msg`를 실행해 주세요."
     ) from exc
 
+try:
+    from python_calamine import CalamineWorkbook
+except ImportError:  # pragma: no cover - optional accelerator
+    CalamineWorkbook = None
+
+WORKBOOK_ACTIVE_TAB_XPATH = etree.XPath(
+    "s:bookViews/s:workbookView/@activeTab",
+    namespaces={"s": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"},
+)
+# 시트 XML에서 오류 값(#N/A, #REF! 등)이 캐시된 셀의 표시.
+ERROR_CELL_MARKER = b' t="e"'
 FIELD_PATTERN = re.compile(r"«([^»]+)»")
+JINJA_FIELD_REPLACEMENT = r"{{ \1 }}"
+# 문단의 run(하이퍼링크 안의 run 포함) 텍스트 노드를 lxml에서 한 번에 가져온다.
+PARAGRAPH_TEXT_XPATH = etree.XPath(
+    "w:r/w:t/text() | w:hyperlink/w:r/w:t/text()",
+    namespaces={"w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main"},
+)
+UNSAFE_FILENAME_PATTERN = re.compile(r"[^A-Za-z0-9._-]+")
+ATTACHMENT_SEPARATOR = re.compile(r"\s*;\s*")
 DEFAULT_SUBJECT_TEMPLATE = "(«관리번호»«국가코드») New trademark application(s) in «국가명칭»"
+# docx2msg는 머리글을 YAML 매핑으로 읽는다. 제목은 MailItem에 직접 넣으므로 빈 매핑만 둔다.
 HEADER_YAML_LINES = (
     "---",
-    "Subject: {{ subject }}",
+    "{}",
 )
+XML_ESCAPE_TABLE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;"})
+PREPARED_TEMPLATE_PREFIX = "address_mailer_prepared_"
+# (원본 템플릿 경로, st_mtime_ns) → (준비된 템플릿 경로, 필드 목록). GUI에서 반복 실행할 때 재사용한다.
+_PREPARED_CACHE: Dict[tuple[str, int], tuple[Path, List[str]]] = {}
+RENDER_AHEAD = 2
+# 큐에 대기 중인 문서 + 변환 중인 문서 + 렌더링 중인 문서가 서로 다른 파일을 쓰도록 돌려 쓴다.
+RENDER_SLOTS = RENDER_AHEAD + 2
+_RENDER_DONE = object()
 
 
 def iter_block_items(doc: _Document) -> Iterable[Paragraph | Table]:
@@ -41,103 +82,151 @@ def iter_block_items(doc: _Document) -> Iterable[Paragraph | Table]:
             yield Table(child, doc)
 
 
-def collect_fields(template_path: Path) -> List[str]:
-    document = Document(template_path)
-    fields: set[str] = set()
-    for item in iter_block_items(document):
-        if isinstance(item, Paragraph):
-            fields.update(FIELD_PATTERN.findall(item.text))
-        else:
-            for row in item.rows:
-                for cell in row.cells:
-                    fields.update(FIELD_PATTERN.findall(cell.text))
-    return sorted(fields)
+def _format_float(value: float) -> str:
+    if value.is_integer():
+        return str(int(value))
+    return str(value)
 
 
-def normalize_value(value) -> str:
-    if value is None:
-        return ""
-    if isinstance(value, str):
-        return value.strip()
-    if isinstance(value, (int,)):
-        return str(value)
-    if isinstance(value, float):
-        if value.is_integer():
-            return str(int(value))
-        return str(value)
-    if isinstance(value, datetime):
-        return value.strftime("%Y-%m-%d")
-    return str(value)
+def _format_datetime(value: datetime) -> str:
+    return value.strftime("%Y-%m-%d")
 
 
-def load_rows(excel_path: Path) -> List[Dict[str, str]]:
-    workbook = openpyxl.load_workbook(excel_path, data_only=True)
-    worksheet = workbook.active
+# 셀 값 타입별 변환 함수. isinstance 체인 대신 type()으로 한 번에 찾는다.
+VALUE_NORMALIZERS: Dict[type, Callable[[object], str]] = {
+    str: str.strip,
+    int: str,
+    float: _format_float,
+    datetime: _format_datetime,
+}
 
-    rows_iter = worksheet.iter_rows(values_only=True)
-    headers = [normalize_value(cell) or "" for cell in next(rows_iter)]
+
+def normalize_value(value) -> str:
+    if value is None:
+        return ""
+    normalizer = VALUE_NORMALIZERS.get(type(value))
+    if normalizer is None:
+        # 하위 클래스 값(bool, datetime 파생 타입 등)은 드물므로 여기서만 isinstance로 찾는다.
+        normalizer = next(
+            (func for kind, func in VALUE_NORMALIZERS.items() if isinstance(value, kind)), str
+        )
+    return normalizer(value)
+
+
+def build_rows(
+    rows_iter: Iterator[Sequence], fields: Iterable[str] | None = None
+) -> List[Dict[str, str]]:
+    # 헤더는 모든 행 dict의 키가 되므로 intern해 두면 조회 시 문자열 비교가 포인터 비교로 끝난다.
+    headers = [sys.intern(normalize_value(cell)) for cell in next(rows_iter)]
+
+    # 사용할 컬럼의 위치를 한 번만 계산해 두고, 행마다 그 위치의 값만 읽는다.
+    wanted = set(fields) if fields is not None else None
+    columns = [
+        (column, header)
+        for column, header in enumerate(headers)
+        if header and (wanted is None or header in wanted)
+    ]
 
     data_rows: List[Dict[str, str]] = []
     for values in rows_iter:
-        row_dict: Dict[str, str] = {}
-        empty = True
-        for header, value in zip(headers, values):
-            if not header:
-                continue
-            text_value = normalize_value(value)
-            if text_value:
-                empty = False
-            row_dict[header] = text_value
-        if not empty:
+        # 완전히 빈 행(시트 끝의 빈 줄 등)은 값 변환 없이 건너뛴다.
+        if not any(value is not None and value != "" for value in values):
+            continue
+        width = len(values)
+        row_dict = {
+            header: normalize_value(values[column]) if column < width else ""
+            for column, header in columns
+        }
+        if any(row_dict.values()):
             data_rows.append(row_dict)
 
     return data_rows
 
 
+def calamine_sheet_index(excel_path: Path) -> int | None:
+    """Return the active sheet index for calamine, or None when openpyxl must read the workbook."""
+    try:
+        with zipfile.ZipFile(excel_path) as archive:
+            # calamine은 #N/A 같은 오류 셀을 빈 문자열로 돌려주므로, 오류 셀이 있으면 openpyxl로 읽는다.
+            for name in archive.namelist():
+                if name.startswith("xl/worksheets/") and ERROR_CELL_MARKER in archive.read(name):
+                    return None
+            active_tabs = WORKBOOK_ACTIVE_TAB_XPATH(etree.fromstring(archive.read("xl/workbook.xml")))
+    except (OSError, KeyError, zipfile.BadZipFile, etree.XMLSyntaxError):
+        return None
+    return int(active_tabs[0]) if active_tabs else 0
+
+
+def load_rows(excel_path: Path, fields: Iterable[str] | None = None) -> List[Dict[str, str]]:
+    sheet_index = calamine_sheet_index(excel_path) if CalamineWorkbook is not None else None
+    if sheet_index is not None:
+        # python-calamine(Rust)이 설치되어 있으면 openpyxl과 같은 활성 시트를 바로 읽는다.
+        calamine_book = CalamineWorkbook.from_path(str(excel_path))
+        try:
+            return build_rows(calamine_book.get_sheet_by_index(sheet_index).iter_rows(), fields)
+        finally:
+            calamine_book.close()
+
+    # read_only 모드는 셀/스타일 객체를 만들지 않고 행을 스트리밍한다.
+    # 이때 zip 항목을 작은 단위로 여러 번 읽으므로 파일은 한 번에 메모리로 읽어 둔다.
+    workbook = openpyxl.load_workbook(
+        io.BytesIO(excel_path.read_bytes()), data_only=True, read_only=True, keep_links=False
+    )
+    try:
+        worksheet = workbook.active
+        # read_only 모드는 <dimension> 태그로 행 크기를 정하므로, 태그가 틀려도 잘리지 않게 초기화한다.
+        worksheet.reset_dimensions()
+        return build_rows(worksheet.iter_rows(values_only=True), fields)
+    finally:
+        workbook.close()
+
+
+def paragraph_fields(paragraph: Paragraph) -> List[str]:
+    # paragraph.text는 run마다 파이썬 객체를 거치므로, 필드 탐색에는 w:t 텍스트만 lxml로 모은다.
+    return FIELD_PATTERN.findall("".join(PARAGRAPH_TEXT_XPATH(paragraph._element)))
+
+
 def convert_paragraph_placeholders(paragraph: Paragraph) -> None:
-    runs = list(paragraph.runs)
-    i = 0
-    while i < len(runs):
-        run = runs[i]
+    start_run = None  # «만 담긴 run. None이 아니면 필드명 조각을 모으는 중이다.
+    name_parts: List[str] = []
+    for run in paragraph.runs:
         text = run.text
-        if not text:
-            i += 1
+        if start_run is not None:
+            run.text = ""
+            if text == "»":
+                start_run.text = f"{{{{ {''.join(name_parts)} }}}}"
+                start_run = None
+            else:
+                name_parts.append(text)
             continue
-        if "«" in text and "»" in text:
-            run.text = re.sub(r"«([^»]+)»", r"{{ \1 }}", text)
-            i += 1
+        if not text:
             continue
         if text == "«":
             start_run = run
-            i += 1
-            name_parts: List[str] = []
-            while i < len(runs) and runs[i].text != "»":
-                name_parts.append(runs[i].text)
-                runs[i].text = ""
-                i += 1
-            field_name = "".join(name_parts)
-            start_run.text = f"{{{{ {field_name} }}}}"
-            if i < len(runs) and runs[i].text == "»":
-                runs[i].text = ""
-                i += 1
-            continue
-        if "«" in text:
+            name_parts = []
+        elif "«" in text and "»" in text:
+            run.text = FIELD_PATTERN.sub(JINJA_FIELD_REPLACEMENT, text)
+        elif "«" in text:
             run.text = text.replace("«", "{{ ")
-        if "»" in text:
-            run.text = run.text.replace("»", " }}")
-        i += 1
+        elif "»" in text:
+            run.text = text.replace("»", " }}")
+    if start_run is not None:
+        # 닫는 »가 없으면 문단 끝까지 모은 조각을 필드명으로 쓴다.
+        start_run.text = f"{{{{ {''.join(name_parts)} }}}}"
 
 
-def prepare_template(original_template: Path, tmp_dir: Path) -> Path:
-    document = Document(original_template)
-
+def prepare_template(document: _Document, output_path: Path) -> tuple[Path, List[str]]:
+    """Convert placeholders to Jinja2 in one pass and return the saved path and the field names found."""
+    fields: set[str] = set()
     for item in iter_block_items(document):
         if isinstance(item, Paragraph):
+            fields.update(paragraph_fields(item))
             convert_paragraph_placeholders(item)
         else:
             for row in item.rows:
                 for cell in row.cells:
                     for para in cell.paragraphs:
+                        fields.update(paragraph_fields(para))
                         convert_paragraph_placeholders(para)
 
     header = document.sections[0].header
@@ -147,27 +236,141 @@ def prepare_template(original_template: Path, tmp_dir: Path) -> Path:
     for line in HEADER_YAML_LINES:
         header.add_paragraph(line)
 
-    temp_path = tmp_dir / "mail_template.docx"
-    document.save(temp_path)
-    return temp_path
+    document.save(output_path)
+    return output_path, sorted(fields)
+
+
+@lru_cache(maxsize=1)
+def prepared_template_dir() -> Path:
+    """Return this process's directory for prepared templates, removed when the process exits."""
+    # 다른 GUI/CLI 프로세스가 같은 템플릿을 준비하더라도 서로의 파일을 덮어쓰지 않도록 프로세스마다 따로 둔다.
+    directory = Path(mkdtemp(prefix=PREPARED_TEMPLATE_PREFIX))
+    atexit.register(shutil.rmtree, directory, ignore_errors=True)
+    return directory
+
+
+def load_prepared_template(template_path: Path) -> tuple[Path, List[str]]:
+    """Return the prepared template and its fields, reusing them until the original file changes."""
+    key = (str(template_path), template_path.stat().st_mtime_ns)
+    cached = _PREPARED_CACHE.get(key)
+    if cached is not None and cached[0].exists():
+        return cached
+
+    # 같은 템플릿의 이전 버전으로 만든 파일은 지운다.
+    for stale_key in [k for k in _PREPARED_CACHE if k[0] == key[0]]:
+        stale_path, _ = _PREPARED_CACHE.pop(stale_key)
+        stale_path.unlink(missing_ok=True)
+
+    directory = prepared_template_dir()
+    digest = hashlib.sha1(f"{key[0]}:{key[1]}".encode("utf-8")).hexdigest()
+    # 임시 이름으로 끝까지 저장한 뒤 교체해, 읽는 쪽이 쓰다 만 파일을 보지 않게 한다.
+    fd, partial_name = mkstemp(suffix=".docx", dir=directory)
+    os.close(fd)
+    partial_path = Path(partial_name)
+    try:
+        # 템플릿은 한 번만 파싱하고, 필드 수집과 Jinja2 변환을 같은 순회에서 처리한다.
+        _, fields = prepare_template(Document(template_path), partial_path)
+        prepared_path = directory / f"{digest}.docx"
+        os.replace(partial_path, prepared_path)
+    except BaseException:
+        partial_path.unlink(missing_ok=True)
+        raise
+    _PREPARED_CACHE[key] = (prepared_path, fields)
+    return prepared_path, fields
+
+
+def render_subject(subject_template: str, row: Dict[str, str]) -> str:
+    """Fill a «»-normalized subject template with the row's values."""
+    return FIELD_PATTERN.sub(lambda match: row.get(match.group(1), ""), subject_template)
+
+
+def _render_worker(
+    prepared_template: Path,
+    rows: Iterable[Dict[str, str]],
+    fields: Sequence[str],
+    subject_template: str,
+    render_dir: Path,
+    rendered: queue.Queue,
+    stop: threading.Event,
+) -> None:
+    try:
+        template = DocxTemplate(prepared_template)
+        # docxtpl은 문서 XML을 from_string으로 컴파일하므로 Jinja 템플릿 캐시는 쓰이지 않는다.
+        # 대신 Environment 하나를 모든 행에서 공유해 render마다 새로 만들지 않게 한다.
+        jinja_env = Environment(auto_reload=False)
+        # render가 끝나면 context를 다시 읽지 않으므로 dict 하나를 행마다 덮어써서 재사용한다.
+        context: Dict[str, str] = dict.fromkeys(fields, "")
+        for index, row in enumerate(rows, start=1):
+            if stop.is_set():
+                return
+            for field in fields:
+                context[field] = escape_docx_text(row.get(field, ""))
+            # 본문의 «subject»에는 완성된 메일 제목을 넣는다.
+            context["subject"] = escape_docx_text(render_subject(subject_template, row))
+            template.render(context, jinja_env)
+            docx_path = render_dir / f"rendered_{index % RENDER_SLOTS}.docx"
+            template.save(docx_path)
+            rendered.put(docx_path)
+    except BaseException as exc:  # 메인 스레드에서 다시 발생시킨다.
+        rendered.put(exc)
+    else:
+        rendered.put(_RENDER_DONE)
+
+
+@contextmanager
+def render_in_background(
+    prepared_template: Path,
+    rows: Iterable[Dict[str, str]],
+    fields: Sequence[str],
+    subject_template: str,
+    render_dir: Path,
+) -> Iterator[Iterator[Path]]:
+    """Render each row to a .docx on a worker thread, up to RENDER_AHEAD ahead of the caller."""
+    rendered: queue.Queue = queue.Queue(maxsize=RENDER_AHEAD)
+    stop = threading.Event()
+    worker = threading.Thread(
+        target=_render_worker,
+        args=(prepared_template, rows, fields, subject_template, render_dir, rendered, stop),
+        daemon=True,
+    )
+    worker.start()
 
+    def rendered_paths() -> Iterator[Path]:
+        while True:
+            item = rendered.get()
+            if item is _RENDER_DONE:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
 
+    try:
+        yield rendered_paths()
+    finally:
+        # 중간에 멈춘 경우에도 put()에서 대기 중인 작업 스레드가 끝날 수 있도록 큐를 비운다.
+        stop.set()
+        while worker.is_alive():
+            try:
+                rendered.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        worker.join()
+
+
+@lru_cache(maxsize=4096)
 def escape_docx_text(value: str) -> str:
-    value = value.replace('&', '&amp;')
-    value = value.replace('<', '&lt;')
-    value = value.replace('>', '&gt;')
-    return value
+    # 국가명칭처럼 여러 행에서 반복되는 값이 많아 결과를 캐시한다.
+    return value.translate(XML_ESCAPE_TABLE)
 
 
 def sanitize_filename(preferred: str, alternate: str, index: int) -> str:
-    candidate = preferred.strip() if preferred else ""
-    candidate = re.sub(r"[^A-Za-z0-9._-]+", "_", candidate)
-    candidate = candidate.strip("._")
-    if not candidate:
-        candidate = re.sub(r"[^A-Za-z0-9._-]+", "_", alternate).strip("._")
-    if not candidate:
-        candidate = f"message_{index:02d}"
-    return candidate
+    for source in (preferred, alternate):
+        if not source:
+            continue
+        candidate = UNSAFE_FILENAME_PATTERN.sub("_", source.strip()).strip("._")
+        if candidate:
+            return candidate
+    return f"message_{index:02d}"
 
 
 def normalize_field_markers(text: str) -> str:
@@ -181,6 +384,29 @@ def extract_template_fields(text: str) -> List[str]:
     return FIELD_PATTERN.findall(normalized)
 
 
+def parse_attachment_paths(value: str, base_dir: Path) -> List[Path]:
+    """Split a semicolon-separated attachment cell into absolute paths (relative to base_dir)."""
+    return [
+        Path(os.path.abspath(base_dir / part))
+        for part in ATTACHMENT_SEPARATOR.split(value.strip())
+        if part
+    ]
+
+
+def index_attachment_files(paths: Iterable[Path]) -> Dict[str, Path]:
+    """Scan each parent directory of *paths* once and map normcase'd file paths to their path."""
+    known_files: Dict[str, Path] = {}
+    for directory in {path.parent for path in paths}:
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_file():
+                        known_files[os.path.normcase(entry.path)] = Path(entry.path)
+        except OSError:
+            continue
+    return known_files
+
+
 def build_argument_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description="엑셀/워드 병합 데이터를 활용해 docx2msg로 Outlook 초안을 생성합니다.",
@@ -229,78 +455,87 @@ def run_mail_merge(
     if not template_path.exists():
         raise SystemExit(f"워드 템플릿을 찾을 수 없습니다: {template_path}")
 
+    prepared_template, available_fields = load_prepared_template(template_path)
+
     with TemporaryDirectory() as tmp:
         tmp_path = Path(tmp)
-        prepared_template = prepare_template(template_path, tmp_path)
-        available_fields = collect_fields(template_path)
-
-        rows = load_rows(excel_path)
-        if not rows:
-            raise SystemExit("엑셀에서 데이터를 찾지 못했습니다.")
-
         subject_template = normalize_field_markers(subject_template or DEFAULT_SUBJECT_TEMPLATE)
 
         # subject_template에서 필드 추출하여 available_fields에 추가
         subject_fields = extract_template_fields(subject_template)
-        all_fields = sorted(set(available_fields) | set(subject_fields))
+        all_fields = sorted(map(sys.intern, set(available_fields) | set(subject_fields)))
+
+        # 템플릿/제목/수신/참조/첨부파일에 쓰이는 컬럼만 읽는다.
+        rows = load_rows(excel_path, [*all_fields, to_field, cc_field, attachment_field])
+        if not rows:
+            raise SystemExit("엑셀에서 데이터를 찾지 못했습니다.")
 
-        missing_fields: List[str] = []
-        for field in all_fields:
-            if all(field not in row or not row[field] for row in rows):
-                missing_fields.append(field)
+        # 모든 행을 한 번만 훑어 값이 있는 필드를 모으고, 전부 찾으면 바로 멈춘다.
+        filled_fields: Set[str] = set()
+        for row in rows:
+            filled_fields.update(key for key, value in row.items() if value)
+            if filled_fields.issuperset(all_fields):
+                break
+        missing_fields = [field for field in all_fields if field not in filled_fields]
         if missing_fields:
             print(
                 "경고: 아래 필드는 엑셀 데이터에서 빈 값입니다 → "
                 + ", ".join(missing_fields)
             )
 
-        generated = 0
-        for index, row in enumerate(rows, start=1):
-            raw_mapping = {key: row.get(key, "") for key in all_fields}
-            escaped_mapping = {key: escape_docx_text(raw_mapping[key]) for key in available_fields}
-
-            subject = subject_template
-            for key, value in raw_mapping.items():
-                subject = subject.replace(f"«{key}»", value)
-                subject = subject.replace(f"<<{key}>>", value)
-
-            to_value = row.get(to_field, "")
-            cc_value = row.get(cc_field, "")
-
-            base_name = sanitize_filename(subject, subject, index)
-
-            context = {**escaped_mapping, "subject": escape_docx_text(subject)}
+        # 첨부파일이 있는 폴더는 한 번씩만 읽어 두고, 행마다 파일별 stat 호출 없이 확인한다.
+        row_attachments = [
+            parse_attachment_paths(row.get(attachment_field, ""), base_dir) for row in rows
+        ]
+        known_files = index_attachment_files(
+            path for attachment_paths in row_attachments for path in attachment_paths
+        )
 
+        generated = 0
+        # docx 렌더링은 작업 스레드가 미리 해 두고, Outlook/Word COM 호출은 이 스레드에서만 한다.
+        # Docx2Msg는 생성할 때 Outlook/Word COM 객체를 연결하므로 한 번만 만들어 모든 행에 재사용한다.
+        with render_in_background(
+            prepared_template, rows, available_fields, subject_template, tmp_path
+        ) as rendered_paths:
             with Docx2Msg(prepared_template) as converter:
-                converter.template.render(context)
-                mail = converter.convert()
-                if to_value:
-                    mail.To = to_value
-                if cc_value:
-                    mail.CC = cc_value
-                html_body = mail.HTMLBody
-
-                # 첨부파일 처리
-                attachment_value = row.get(attachment_field, "")
-                if attachment_value:
-                    attachment_paths = [p.strip() for p in attachment_value.split(";") if p.strip()]
-                    for attachment_path_str in attachment_paths:
-                        attachment_path = Path(attachment_path_str)
-                        if not attachment_path.is_absolute():
-                            attachment_path = base_dir / attachment_path
-
-                        if attachment_path.exists():
-                            mail.Attachments.Add(str(attachment_path.resolve()))
+                for index, (row, attachment_paths, rendered_docx) in enumerate(
+                    zip(rows, row_attachments, rendered_paths), start=1
+                ):
+                    # subject_template은 이미 «» 형식으로 정규화되어 있으므로 한 번의 치환으로 끝난다.
+                    subject = render_subject(subject_template, row)
+
+                    to_value = row.get(to_field, "")
+                    cc_value = row.get(cc_field, "")
+
+                    base_name = sanitize_filename(subject, subject, index)
+
+                    # 이미 렌더링된 문서를 넘기므로 converter.template은 쓰지 않는다.
+                    converter.docx_path = rendered_docx
+                    mail = converter.convert()
+                    mail.Subject = subject
+                    if to_value:
+                        mail.To = to_value
+                    if cc_value:
+                        mail.CC = cc_value
+
+                    # 첨부파일 처리
+                    for attachment_path in attachment_paths:
+                        found = known_files.get(os.path.normcase(attachment_path))
+                        if found is None and attachment_path.exists():
+                            found = attachment_path.resolve()
+
+                        if found is not None:
+                            mail.Attachments.Add(str(found))
                             print(f"  Added attachment: {attachment_path.name}")
                         else:
                             print(f"  Warning: Attachment not found: {attachment_path}")
 
-                msg_path = output_dir / f"{base_name}.msg"
-                mail.SaveAs(str(msg_path.resolve()), 3)
-                generated += 1
-                print(f"Saved MSG: {msg_path}")
+                    msg_path = output_dir / f"{base_name}.msg"
+                    mail.SaveAs(str(msg_path.resolve()), 3)
+                    generated += 1
+                    print(f"Saved MSG: {msg_path}")
 
-                mail.Close(False)
+                    mail.Close(False)
 
         print(f"완료: {generated}개의 MSG 파일을 {output_dir}에 생성했습니다.")
 